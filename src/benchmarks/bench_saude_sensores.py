@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+FarmTech Solutions - Benchmark do Detector de Anomalias
+============================================================================
+Mede a vazão (amostras/s) do DetectorAnomalias sobre streams sintéticos
+intercalados de muitos dispositivos, com falhas injetadas (picos, leituras
+fora da faixa, sensores travados e relés oscilando).
+
+Uso:
+    python bench_saude_sensores.py --dispositivos 5000 --amostras 100
+
+Autor: FarmTech Solutions
+Data: 2025
+Versão: 1.0
+============================================================================
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "utils"))
+
+from saude_sensores import DetectorAnomalias
+
+
+# Período do resumo enviado pelo firmware (LOG_MS = 1800 em logResumo)
+INTERVALO_RESUMO_S = 1.8
+
+
+def gerar_telemetria(dispositivos: int, amostras: int, taxa_falhas: float, semente: int) -> list:
+    """
+    Gera telemetria sintética intercalada (uma rodada por instante de tempo).
+
+    Args:
+        dispositivos: Número de dispositivos simulados
+        amostras: Amostras por dispositivo
+        taxa_falhas: Fração dos dispositivos com alguma falha injetada
+        semente: Semente do gerador aleatório
+
+    Returns:
+        list: Amostras de telemetria em ordem de chegada
+    """
+    rng = random.Random(semente)
+    ids = [f"esp32-{i:05d}" for i in range(dispositivos)]
+    falhas = {}
+    for dispositivo in ids:
+        if rng.random() < taxa_falhas:
+            falhas[dispositivo] = rng.choice(("pico", "faixa", "travado", "rele"))
+
+    telemetria = []
+    for t in range(amostras):
+        timestamp = t * INTERVALO_RESUMO_S
+        for dispositivo in ids:
+            falha = falhas.get(dispositivo)
+            umidade = rng.gauss(55.0, 2.0)
+            temperatura = rng.gauss(25.0, 0.5)
+            ldr = rng.gauss(2000.0, 60.0)
+            rele = umidade < 45.0
+            if falha == "pico" and t % 17 == 16:
+                umidade += 40.0
+            elif falha == "faixa" and t % 11 == 10:
+                temperatura = 150.0
+            elif falha == "travado" and t > amostras // 4:
+                ldr = 4095.0
+            elif falha == "rele":
+                rele = t % 2 == 0
+            telemetria.append({
+                "dispositivo": dispositivo,
+                "timestamp": timestamp,
+                "umidade": umidade,
+                "temperatura": temperatura,
+                "ldr": ldr,
+                "ph": rng.gauss(6.5, 0.1),
+                "rele": rele,
+            })
+    return telemetria
+
+
+def executar(dispositivos: int, amostras: int, taxa_falhas: float, semente: int) -> dict:
+    """
+    Executa o benchmark e retorna as métricas medidas.
+
+    Returns:
+        dict: total de amostras, tempo, vazão, alertas e amostras excluídas
+    """
+    telemetria = gerar_telemetria(dispositivos, amostras, taxa_falhas, semente)
+    alertas = []
+    detector = DetectorAnomalias(ao_alertar=alertas.append)
+    processar = detector.processar
+
+    excluidas = 0
+    inicio = time.perf_counter()
+    for amostra in telemetria:
+        if not processar(amostra).valida:
+            excluidas += 1
+    duracao = time.perf_counter() - inicio
+
+    return {
+        "amostras": len(telemetria),
+        "segundos": duracao,
+        "amostras_por_segundo": len(telemetria) / duracao if duracao > 0 else float("inf"),
+        "alertas": len(alertas),
+        "excluidas": excluidas,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do detector de anomalias")
+    parser.add_argument("--dispositivos", type=int, default=5000)
+    parser.add_argument("--amostras", type=int, default=100, help="amostras por dispositivo")
+    parser.add_argument("--taxa-falhas", type=float, default=0.05)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    resultado = executar(args.dispositivos, args.amostras, args.taxa_falhas, args.semente)
+
+    print("FarmTech Solutions - Benchmark do Detector de Anomalias")
+    print("=" * 60)
+    print(f"Dispositivos:          {args.dispositivos}")
+    print(f"Amostras processadas:  {resultado['amostras']}")
+    print(f"Tempo total:           {resultado['segundos']:.3f} s")
+    print(f"Vazão:                 {resultado['amostras_por_segundo']:,.0f} amostras/s")
+    print(f"Alertas emitidos:      {resultado['alertas']}")
+    print(f"Amostras excluídas:    {resultado['excluidas']}")
+    # Cada dispositivo envia um resumo a cada INTERVALO_RESUMO_S
+    capacidade = resultado['amostras_por_segundo'] * INTERVALO_RESUMO_S
+    print(f"Capacidade estimada:   {capacidade:,.0f} dispositivos/núcleo "
+          f"(1 amostra a cada {INTERVALO_RESUMO_S} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+FarmTech Solutions - Suíte de Regressão de Desempenho
+============================================================================
+Mede latência e alocação de memória dos caminhos críticos do projeto e
+compara com um baseline versionado no repositório
+(`baseline_desempenho.json`).
+
+Uma regressão de latência só é reportada quando a mediana piora além do
+limiar E o teste de Mann-Whitney (unilateral) indica diferença
+significativa. Alocações são determinísticas e comparadas diretamente.
+Para tornar o baseline portável entre máquinas, as latências são
+normalizadas por um laço de calibração em Python puro.
+
+Executa offline, apenas com a biblioteca padrão.
+
+Uso:
+    python regressao_desempenho.py                    # Compara com o baseline
+    python regressao_desempenho.py --salvar-baseline  # Regrava o baseline
+    python regressao_desempenho.py --filtro previsao  # Apenas alguns casos
+
+Código de saída: 0 sem regressões, 1 com regressões, 2 sem baseline.
+
+Autor: FarmTech Solutions
+Data: 2025
+Versão: 1.0
+============================================================================
+"""
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import argparse
+import contextlib
+import gc
+import io
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "esp32"))
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "utils"))
+
+import integracao_meteorologica_independente as integracao
+from traducao_climatica import traduzir_condicao_climatica
+from saude_sensores import DetectorAnomalias
+
+BASELINE_PADRAO = os.path.join(os.path.dirname(__file__), "baseline_desempenho.json")
+
+# Tempo mínimo de cada lote medido; lotes curtos demais são dominados pelo timer
+DURACAO_MINIMA_LOTE_S = 0.01
+
+# Regressões de alocação menores que isso são ignoradas (ruído do alocador)
+TOLERANCIA_ALOCACAO_BYTES = 256
+
+# Saída típica do script R de API meteorológica
+SAIDA_R_EXEMPLO = (
+    "Consultando WeatherAPI para Sao Paulo...\n"
+    "Traduzindo: 'Partly cloudy' -> 'Parcialmente nublado'\n"
+    "Chance de chuva: 25.0%\n"
+    "Temperatura maxima: 28.5\n"
+    "Temperatura minima: 18.2\n"
+    "\n"
+    "LINHA PARA ESP32:\n"
+    "CHUVA:25.0;TEMP_MAX:28.5;TEMP_MIN:18.2;CONDICAO:Parcialmente nublado\n"
+)
+
+LINHA_ESP32_EXEMPLO = "CHUVA:25.0;TEMP_MAX:28.5;TEMP_MIN:18.2;CONDICAO:Parcialmente nublado"
+
+
+class Caso(NamedTuple):
+    """
+    Benchmark de um caminho crítico.
+
+    `preparar` recebe uma ExitStack que permanece ativa durante toda a
+    medição do caso (patches, redirecionamentos) e retorna a função medida.
+    """
+    nome: str
+    preparar: Callable[[contextlib.ExitStack], Callable[[], object]]
+
+
+class Medicao(NamedTuple):
+    """Resultado da medição de um caso."""
+    amostras_s: List[float]
+    pico_bytes: int
+    retido_bytes: int
+
+    @property
+    def mediana_s(self) -> float:
+        return statistics.median(self.amostras_s)
+
+
+class Comparacao(NamedTuple):
+    """Comparação de um caso com o baseline."""
+    nome: str
+    razao_latencia: float
+    p_valor: float
+    pico_bytes: int
+    pico_bytes_baseline: int
+    regressao_latencia: bool
+    regressao_alocacao: bool
+
+
+# ============================================================================
+# Casos de benchmark
+# ============================================================================
+
+def _preparar_extrair_dados(pilha):
+    return lambda: integracao.extrair_dados_formatados(SAIDA_R_EXEMPLO)
+
+
+def _preparar_validar_dados(pilha):
+    return lambda: integracao.validar_dados_formatados(LINHA_ESP32_EXEMPLO)
+
+
+def _preparar_processar_previsao(pilha):
+    dados = {"temperatura": 31.0, "umidade": 65.0, "chance_chuva": 30.0, "precipitacao_mm": 0.0}
+    return lambda: integracao.processar_previsao(dados)
+
+
+def _preparar_traduzir_condicao(pilha):
+    return lambda: traduzir_condicao_climatica("Moderate or heavy rain with thunder")
+
+
+class _Descarte(io.TextIOBase):
+    """Saída de texto que descarta tudo o que recebe."""
+
+    def write(self, texto: str) -> int:
+        return len(texto)
+
+
+def _preparar_main(pilha):
+    # Backend R substituído pela saída de exemplo e stdout descartado uma
+    # única vez: a montagem do patch custaria mais que o próprio main()
+    pilha.enter_context(mock.patch.object(integracao, "executar_api_r_independente",
+                                          return_value=SAIDA_R_EXEMPLO))
+    pilha.enter_context(contextlib.redirect_stdout(_Descarte()))
+    return integracao.main
+
+
+def _preparar_detector_anomalias(pilha):
+    detector = DetectorAnomalias()
+    amostras = [
+        {"dispositivo": f"esp32-{i % 100:03d}", "timestamp": i * 2.0,
+         "umidade": 55.0 + (i % 7) * 0.4, "temperatura": 25.0 + (i % 5) * 0.1,
+         "ldr": 2000.0 + (i % 11) * 15.0, "ph": 6.5 + (i % 3) * 0.05, "rele": i % 40 < 20}
+        for i in range(1000)
+    ]
+    estado = {"i": 0}
+
+    def executar():
+        i = estado["i"]
+        estado["i"] = (i + 1) % len(amostras)
+        return detector.processar(amostras[i])
+    return executar
+
+
+CASOS: List[Caso] = [
+    Caso("extrair_dados_formatados", _preparar_extrair_dados),
+    Caso("validar_dados_formatados", _preparar_validar_dados),
+    Caso("processar_previsao", _preparar_processar_previsao),
+    Caso("traduzir_condicao_climatica", _preparar_traduzir_condicao),
+    Caso("main_backend_simulado", _preparar_main),
+    Caso("detector_anomalias_processar", _preparar_detector_anomalias),
+]
+
+
+# ============================================================================
+# Medição
+# ============================================================================
+
+def _calibrar(repeticoes: int = 15) -> float:
+    """
+    Mede um laço de referência em Python puro.
+
+    A razão entre calibrações de duas máquinas aproxima a diferença de
+    velocidade do interpretador e é usada para escalar o baseline.
+
+    Returns:
+        float: Mediana do tempo do laço de referência, em segundos
+    """
+    def referencia():
+        total = 0
+        tabela = {}
+        for i in range(20000):
+            total += i * i
+            tabela[i & 255] = total
+        return total
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        referencia()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def _tamanho_lote(funcao: Callable[[], object]) -> int:
+    """Escolhe quantas chamadas por lote para durar ao menos DURACAO_MINIMA_LOTE_S."""
+    numero = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(numero):
+            funcao()
+        if time.perf_counter() - inicio >= DURACAO_MINIMA_LOTE_S:
+            return numero
+        numero *= 2
+
+
+def medir(caso: Caso, repeticoes: int) -> Medicao:
+    """
+    Mede latência por chamada e alocação de memória de um caso.
+
+    Args:
+        caso: Caso a medir
+        repeticoes: Número de lotes cronometrados (amostras de latência)
+
+    Returns:
+        Medicao: Latências por chamada (s), pico e memória retida (bytes)
+    """
+    with contextlib.ExitStack() as pilha:
+        funcao = caso.preparar(pilha)
+        return _medir_funcao(funcao, repeticoes)
+
+
+def _medir_funcao(funcao: Callable[[], object], repeticoes: int) -> Medicao:
+    """Cronometra lotes de chamadas e mede a alocação de uma função pronta."""
+    numero = _tamanho_lote(funcao)
+
+    # Como no timeit, o coletor de lixo não interfere na cronometragem
+    gc_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        amostras = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            for _ in range(numero):
+                funcao()
+            amostras.append((time.perf_counter() - inicio) / numero)
+    finally:
+        if gc_ativo:
+            gc.enable()
+
+    # Alocação medida fora da cronometragem: tracemalloc distorce a latência
+    tracemalloc.start()
+    try:
+        # Aquecimento sob rastreamento: estado criado antes do start() e
+        # substituído depois contaria como memória retida
+        for _ in range(100):
+            funcao()
+        gc.collect()
+        antes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+        for _ in range(99):
+            funcao()
+        gc.collect()
+        depois, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Medicao(amostras, max(0, pico - antes), max(0, depois - antes))
+
+
+# ============================================================================
+# Estatística
+# ============================================================================
+
+def mann_whitney_maior(atual: List[float], base: List[float]) -> float:
+    """
+    Teste de Mann-Whitney U unilateral: H1 = `atual` tende a ser maior.
+
+    Usa a aproximação normal com correção de empates e de continuidade,
+    adequada a partir de ~8 amostras por grupo.
+
+    Args:
+        atual: Amostras da execução atual
+        base: Amostras do baseline
+
+    Returns:
+        float: p-valor (pequeno indica que `atual` é significativamente maior)
+    """
+    n1, n2 = len(atual), len(base)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+
+    combinados = sorted([(v, 0) for v in atual] + [(v, 1) for v in base])
+    n = n1 + n2
+    soma_postos_atual = 0.0
+    correcao_empates = 0.0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and combinados[j + 1][0] == combinados[i][0]:
+            j += 1
+        posto_medio = (i + j) / 2.0 + 1.0
+        empatados = j - i + 1
+        correcao_empates += empatados ** 3 - empatados
+        for k in range(i, j + 1):
+            if combinados[k][1] == 0:
+                soma_postos_atual += posto_medio
+        i = j + 1
+
+    u = soma_postos_atual - n1 * (n1 + 1) / 2.0
+    media_u = n1 * n2 / 2.0
+    variancia_u = n1 * n2 / 12.0 * ((n + 1) - correcao_empates / (n * (n - 1)))
+    if variancia_u <= 0:
+        return 1.0
+    z = (u - media_u - 0.5) / math.sqrt(variancia_u)
+    return 0.5 * math.erfc(z / math.sqrt(2.0))
+
+
+def comparar(nome: str, medicao: Medicao, base: dict, fator_maquina: float,
+             limiar_latencia: float, limiar_alocacao: float, alfa: float) -> Comparacao:
+    """
+    Compara a medição de um caso com sua entrada no baseline.
+
+    Args:
+        nome: Nome do caso
+        medicao: Medição atual
+        base: Entrada do caso no baseline
+        fator_maquina: Calibração atual / calibração do baseline
+        limiar_latencia: Piora relativa tolerada na mediana (ex.: 0.25 = 25%)
+        limiar_alocacao: Piora relativa tolerada no pico de alocação
+        alfa: Nível de significância do teste de Mann-Whitney
+
+    Returns:
+        Comparacao: Razões, p-valor e indicadores de regressão
+    """
+    base_escalada = [v * fator_maquina for v in base["amostras_s"]]
+    razao = medicao.mediana_s / statistics.median(base_escalada)
+    p_valor = mann_whitney_maior(medicao.amostras_s, base_escalada)
+    regressao_latencia = razao > 1.0 + limiar_latencia and p_valor < alfa
+
+    pico_base = base["pico_bytes"]
+    limite_pico = max(pico_base * (1.0 + limiar_alocacao), pico_base + TOLERANCIA_ALOCACAO_BYTES)
+    retido_base = base["retido_bytes"]
+    limite_retido = max(retido_base * (1.0 + limiar_alocacao), retido_base + TOLERANCIA_ALOCACAO_BYTES)
+    regressao_alocacao = medicao.pico_bytes > limite_pico or medicao.retido_bytes > limite_retido
+
+    return Comparacao(nome, razao, p_valor, medicao.pico_bytes, pico_base,
+                      regressao_latencia, regressao_alocacao)
+
+
+# ============================================================================
+# Baseline
+# ============================================================================
+
+def salvar_baseline(caminho: str, calibracao_s: float, medicoes: Dict[str, Medicao]) -> None:
+    """Grava as medições atuais como novo baseline."""
+    dados = {
+        "versao": 1,
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "calibracao_s": calibracao_s,
+        "benchmarks": {
+            nome: {
+                "mediana_s": m.mediana_s,
+                "amostras_s": [float(f"{v:.4g}") for v in m.amostras_s],
+                "pico_bytes": m.pico_bytes,
+                "retido_bytes": m.retido_bytes,
+            }
+            for nome, m in medicoes.items()
+        },
+    }
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def carregar_baseline(caminho: str) -> Optional[dict]:
+    """Carrega o baseline, ou None se o arquivo não existir."""
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ============================================================================
+# Execução
+# ============================================================================
+
+def _formatar_tempo(segundos: float) -> str:
+    if segundos < 1e-3:
+        return f"{segundos * 1e6:8.2f} µs"
+    return f"{segundos * 1e3:8.2f} ms"
+
+
+def _medir_neste_processo(casos: List[Caso], repeticoes: int) -> Tuple[float, Dict[str, Medicao]]:
+    """
+    Mede os casos no processo atual, com logging desativado.
+
+    Returns:
+        Tuple[float, Dict[str, Medicao]]: Calibração (s) e medições por caso
+    """
+    logging.disable(logging.CRITICAL)
+    try:
+        calibracao = _calibrar()
+        medicoes = {caso.nome: medir(caso, repeticoes) for caso in casos}
+    finally:
+        logging.disable(logging.NOTSET)
+    return calibracao, medicoes
+
+
+def executar(casos: List[Caso], processos: int, repeticoes: int) -> Tuple[float, Dict[str, Medicao]]:
+    """
+    Mede os casos em vários processos novos e agrupa as amostras.
+
+    A latência de funções curtas varia bastante entre processos (layout de
+    memória, sementes de hash); amostrar um único processo tornaria o teste
+    estatístico otimista demais.
+
+    Args:
+        casos: Casos a medir
+        processos: Número de processos trabalhadores, executados em sequência
+        repeticoes: Lotes cronometrados por caso em cada processo
+
+    Returns:
+        Tuple[float, Dict[str, Medicao]]: Calibração mediana (s) e medições agrupadas
+
+    Raises:
+        RuntimeError: Se algum processo trabalhador falhar
+    """
+    nomes = [caso.nome for caso in casos]
+    comando = [sys.executable, os.path.abspath(__file__), "--trabalhador",
+               "--repeticoes", str(repeticoes), "--casos", ",".join(nomes)]
+
+    calibracoes = []
+    amostras: Dict[str, List[float]] = {nome: [] for nome in nomes}
+    picos: Dict[str, List[int]] = {nome: [] for nome in nomes}
+    retidos: Dict[str, List[int]] = {nome: [] for nome in nomes}
+    for _ in range(processos):
+        resultado = subprocess.run(comando, capture_output=True, text=True, encoding="utf-8")
+        if resultado.returncode != 0:
+            raise RuntimeError(f"Processo trabalhador falhou: {resultado.stderr.strip()}")
+        dados = json.loads(resultado.stdout)
+        calibracoes.append(dados["calibracao_s"])
+        for nome, m in dados["benchmarks"].items():
+            amostras[nome].extend(m["amostras_s"])
+            picos[nome].append(m["pico_bytes"])
+            retidos[nome].append(m["retido_bytes"])
+
+    medicoes = {
+        nome: Medicao(amostras[nome], int(statistics.median(picos[nome])),
+                      int(statistics.median(retidos[nome])))
+        for nome in nomes
+    }
+    return statistics.median(calibracoes), medicoes
+
+
+def _trabalhador(nomes: List[str], repeticoes: int) -> int:
+    """Mede os casos pedidos e escreve o resultado em JSON na saída padrão."""
+    casos = [c for c in CASOS if c.nome in nomes]
+    calibracao, medicoes = _medir_neste_processo(casos, repeticoes)
+    json.dump({
+        "calibracao_s": calibracao,
+        "benchmarks": {nome: m._asdict() for nome, m in medicoes.items()},
+    }, sys.stdout)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Suíte de regressão de desempenho FarmTech")
+    parser.add_argument("--baseline", default=BASELINE_PADRAO, help="arquivo JSON do baseline")
+    parser.add_argument("--salvar-baseline", action="store_true",
+                        help="grava as medições atuais como novo baseline")
+    parser.add_argument("--processos", type=int, default=8,
+                        help="processos trabalhadores independentes (padrão: 8)")
+    parser.add_argument("--repeticoes", type=int, default=10,
+                        help="lotes cronometrados por caso em cada processo (padrão: 10)")
+    parser.add_argument("--limiar-latencia", type=float, default=0.25,
+                        help="piora relativa tolerada na mediana (padrão: 0.25)")
+    parser.add_argument("--limiar-alocacao", type=float, default=0.10,
+                        help="piora relativa tolerada na alocação (padrão: 0.10)")
+    parser.add_argument("--alfa", type=float, default=0.01,
+                        help="nível de significância do teste estatístico (padrão: 0.01)")
+    parser.add_argument("--filtro", default="", help="executa apenas casos cujo nome contém o texto")
+    parser.add_argument("--trabalhador", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--casos", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.trabalhador:
+        return _trabalhador(args.casos.split(","), args.repeticoes)
+
+    casos = [c for c in CASOS if args.filtro in c.nome]
+    if not casos:
+        print(f"❌ Nenhum caso corresponde ao filtro '{args.filtro}'")
+        return 2
+    if args.salvar_baseline and args.filtro:
+        print("❌ --salvar-baseline não pode ser combinado com --filtro")
+        return 2
+
+    print("FarmTech Solutions - Regressão de Desempenho")
+    print("=" * 78)
+    calibracao, medicoes = executar(casos, args.processos, args.repeticoes)
+
+    if args.salvar_baseline:
+        salvar_baseline(args.baseline, calibracao, medicoes)
+        for nome, m in medicoes.items():
+            print(f"  {nome:<30} {_formatar_tempo(m.mediana_s)}  pico={m.pico_bytes:>7} B")
+        print(f"\n✅ Baseline gravado em {args.baseline}")
+        return 0
+
+    baseline = carregar_baseline(args.baseline)
+    if baseline is None:
+        print(f"❌ Baseline não encontrado: {args.baseline}")
+        print("   Gere com: python regressao_desempenho.py --salvar-baseline")
+        return 2
+
+    fator = calibracao / baseline["calibracao_s"]
+    print(f"Fator de calibração da máquina: {fator:.2f}x (relativo ao baseline)")
+    print(f"{'caso':<30} {'mediana':>11} {'razão':>7} {'p-valor':>8} {'pico (B)':>16}  status")
+    print("-" * 78)
+
+    regressoes = 0
+    for nome, m in medicoes.items():
+        base = baseline["benchmarks"].get(nome)
+        if base is None:
+            print(f"{nome:<30} {_formatar_tempo(m.mediana_s)}  {'':>7} {'':>8} "
+                  f"{m.pico_bytes:>16}  ⚠️  sem baseline")
+            continue
+        c = comparar(nome, m, base, fator, args.limiar_latencia, args.limiar_alocacao, args.alfa)
+        if c.regressao_latencia or c.regressao_alocacao:
+            regressoes += 1
+            motivos = []
+            if c.regressao_latencia:
+                motivos.append("latência")
+            if c.regressao_alocacao:
+                motivos.append("alocação")
+            status = "❌ REGRESSÃO (" + ", ".join(motivos) + ")"
+        else:
+            status = "✅ OK"
+        pico = f"{c.pico_bytes}/{c.pico_bytes_baseline}"
+        print(f"{nome:<30} {_formatar_tempo(m.mediana_s)} {c.razao_latencia:>6.2f}x "
+              f"{c.p_valor:>8.4f} {pico:>16}  {status}")
+
+    print("-" * 78)
+    if regressoes:
+        print(f"❌ {regressoes} caso(s) com regressão de desempenho")
+        return 1
+    print("✅ Nenhuma regressão de desempenho detectada")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,39 +11,30 @@ class TestIntegracaoMeteorologica(unittest.TestCase):
         self.longitude = -46.6333
         
     def test_formato_dados_meteorologicos(self):
-        try:
-            dados = obter_dados_meteorologicos(self.latitude, self.longitude)
-            self.assertIsInstance(dados, dict)
-            campos_necessarios = ['temperatura', 'umidade', 'chance_chuva']
-            for campo in campos_necessarios:
-                self.assertIn(campo, dados)
-                self.assertIsNotNone(dados[campo])
-            print("✓ OK: Formato dos dados meteorológicos válido")
-        except Exception as e:
-            print(f"❌ FALHA: Erro ao obter dados meteorológicos - {str(e)}")
+        dados = obter_dados_meteorologicos(self.latitude, self.longitude)
+        self.assertIsInstance(dados, dict)
+        campos_necessarios = ['temperatura', 'umidade', 'chance_chuva']
+        for campo in campos_necessarios:
+            self.assertIn(campo, dados)
+            self.assertIsNotNone(dados[campo])
+        print("✓ OK: Formato dos dados meteorológicos válido")
             
     def test_validacao_parametros(self):
-        try:
-            with self.assertRaises(ValueError):
-                obter_dados_meteorologicos(91, 0)
-            with self.assertRaises(ValueError):
-                obter_dados_meteorologicos(0, 181)
-            print("✓ OK: Validação de parâmetros funcionando")
-        except Exception as e:
-            print(f"❌ FALHA: Erro na validação de parâmetros - {str(e)}")
+        with self.assertRaises(ValueError):
+            obter_dados_meteorologicos(91, 0)
+        with self.assertRaises(ValueError):
+            obter_dados_meteorologicos(0, 181)
+        print("✓ OK: Validação de parâmetros funcionando")
             
     def test_processamento_previsao(self):
-        try:
-            dados = {
-                'temperatura': 25,
-                'umidade': 60,
-                'chance_chuva': 80
-            }
-            decisao = processar_previsao(dados)
-            self.assertIsInstance(decisao, bool)
-            print("✓ OK: Processamento da previsão funcionando")
-        except Exception as e:
-            print(f"❌ FALHA: Erro no processamento da previsão - {str(e)}")
+        dados = {
+            'temperatura': 25,
+            'umidade': 60,
+            'chance_chuva': 80
+        }
+        decisao = processar_previsao(dados)
+        self.assertIsInstance(decisao, bool)
+        print("✓ OK: Processamento da previsão funcionando")
 
 if __name__ == '__main__':
     print("Iniciando testes unitários para integração meteorológica...")
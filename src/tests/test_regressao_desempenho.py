@@ -0,0 +1,71 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import regressao_desempenho
+from regressao_desempenho import CASOS, Medicao, comparar, mann_whitney_maior, medir
+
+
+def entrada_baseline(amostras, pico=1000, retido=32):
+    return {'amostras_s': amostras, 'pico_bytes': pico, 'retido_bytes': retido}
+
+
+class TestRegressaoDesempenho(unittest.TestCase):
+    def setUp(self):
+        self.base = [1.0e-6 + i * 1.0e-9 for i in range(30)]
+
+    def test_mann_whitney_detecta_deslocamento(self):
+        maior = [v * 1.5 for v in self.base]
+        self.assertLess(mann_whitney_maior(maior, self.base), 0.001)
+        self.assertGreater(mann_whitney_maior(self.base, maior), 0.99)
+
+    def test_mann_whitney_amostras_iguais(self):
+        self.assertGreater(mann_whitney_maior(self.base, list(self.base)), 0.4)
+        self.assertEqual(mann_whitney_maior([], self.base), 1.0)
+
+    def test_sem_regressao(self):
+        medicao = Medicao(list(self.base), 1000, 32)
+        c = comparar('caso', medicao, entrada_baseline(self.base), 1.0, 0.25, 0.10, 0.01)
+        self.assertFalse(c.regressao_latencia)
+        self.assertFalse(c.regressao_alocacao)
+
+    def test_regressao_latencia(self):
+        medicao = Medicao([v * 1.5 for v in self.base], 1000, 32)
+        c = comparar('caso', medicao, entrada_baseline(self.base), 1.0, 0.25, 0.10, 0.01)
+        self.assertTrue(c.regressao_latencia)
+
+    def test_fator_maquina_compensa_latencia(self):
+        medicao = Medicao([v * 1.5 for v in self.base], 1000, 32)
+        c = comparar('caso', medicao, entrada_baseline(self.base), 1.5, 0.25, 0.10, 0.01)
+        self.assertFalse(c.regressao_latencia)
+
+    def test_regressao_alocacao(self):
+        medicao = Medicao(list(self.base), 2000, 32)
+        c = comparar('caso', medicao, entrada_baseline(self.base), 1.0, 0.25, 0.10, 0.01)
+        self.assertTrue(c.regressao_alocacao)
+        # Diferenças pequenas ficam dentro da tolerância do alocador
+        medicao = Medicao(list(self.base), 1100, 200)
+        c = comparar('caso', medicao, entrada_baseline(self.base), 1.0, 0.25, 0.10, 0.01)
+        self.assertFalse(c.regressao_alocacao)
+
+    def test_medir_caso(self):
+        caso = next(c for c in CASOS if c.nome == 'processar_previsao')
+        medicao = medir(caso, 3)
+        self.assertEqual(len(medicao.amostras_s), 3)
+        self.assertGreater(medicao.mediana_s, 0)
+        self.assertGreater(medicao.pico_bytes, 0)
+
+    def test_salvar_baseline_com_filtro_recusado_antes_de_medir(self):
+        with mock.patch.object(regressao_desempenho, 'executar') as executar, \
+                redirect_stdout(io.StringIO()):
+            codigo = regressao_desempenho.main(['--salvar-baseline', '--filtro', 'main'])
+        self.assertEqual(codigo, 2)
+        executar.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'utils'))
+
+from saude_sensores import (
+    DetectorAnomalias, filtrar_telemetria, interpretar_linha_resumo,
+    ALERTA_FORA_DA_FAIXA, ALERTA_VALOR_TRAVADO, ALERTA_PICO,
+    ALERTA_MUDANCA_NIVEL, ALERTA_RELE_OSCILANDO
+)
+
+
+def amostra(t, umidade, dispositivo='esp32-01', **extras):
+    dados = {'dispositivo': dispositivo, 'timestamp': float(t), 'umidade': umidade}
+    dados.update(extras)
+    return dados
+
+
+class TestSaudeSensores(unittest.TestCase):
+    def setUp(self):
+        self.alertas = []
+        self.detector = DetectorAnomalias(ao_alertar=self.alertas.append)
+
+    def aquecer(self, n=40, dispositivo='esp32-01'):
+        for t in range(n):
+            self.detector.processar(amostra(t, 50.0 + (t % 5) * 0.3, dispositivo))
+
+    def tipos(self):
+        return [a.tipo for a in self.alertas]
+
+    def test_fora_da_faixa_exclui_amostra(self):
+        resultado = self.detector.processar(amostra(0, 120.0))
+        self.assertFalse(resultado.valida)
+        self.assertEqual(resultado.canais_excluidos, ('umidade',))
+        self.assertEqual(self.tipos(), [ALERTA_FORA_DA_FAIXA])
+
+    def test_valor_travado_alerta_uma_vez(self):
+        # Umidade idêntica por 20 minutos, uma leitura por minuto
+        resultados = [self.detector.processar(amostra(t * 60, 42.0)) for t in range(21)]
+        self.assertTrue(resultados[14].valida)
+        self.assertFalse(resultados[15].valida)
+        self.assertFalse(resultados[-1].valida)
+        self.assertEqual(self.tipos(), [ALERTA_VALOR_TRAVADO])
+        # Leitura diferente encerra o travamento
+        self.assertTrue(self.detector.processar(amostra(21 * 60, 42.5)).valida)
+
+    def test_temperatura_estavel_nao_trava(self):
+        # logResumo a cada 1.8 s (LOG_MS) com T arredondada para 0.1: 18 min estável
+        resultados = [self.detector.processar(amostra(t * 1.8, 50.0 + (t % 5) * 0.3,
+                                                      temperatura=24.0))
+                      for t in range(600)]
+        self.assertTrue(all(r.valida for r in resultados))
+        self.assertEqual(self.alertas, [])
+
+    def test_canal_travado_nao_descarta_outros_canais(self):
+        amostras = [amostra(t, 50.0 + (t % 5) * 0.3, ldr=4095.0) for t in range(200)]
+        filtradas = list(filtrar_telemetria(amostras, self.detector))
+        self.assertEqual(len(filtradas), 200)
+        self.assertEqual(self.tipos(), [ALERTA_VALOR_TRAVADO])
+        self.assertIsNone(filtradas[-1]['ldr'])
+        self.assertEqual(filtradas[-1]['umidade'], amostras[-1]['umidade'])
+        self.assertEqual(amostras[-1]['ldr'], 4095.0)
+
+    def test_pico_isolado(self):
+        self.aquecer()
+        resultado = self.detector.processar(amostra(100, 90.0))
+        self.assertFalse(resultado.valida)
+        self.assertEqual(self.tipos(), [ALERTA_PICO])
+        self.assertTrue(self.detector.processar(amostra(101, 50.3)).valida)
+
+    def test_mudanca_de_nivel_nao_exclui(self):
+        self.aquecer()
+        resultados = [self.detector.processar(amostra(100 + t, 52.5 + (t % 3) * 0.2))
+                      for t in range(20)]
+        self.assertIn(ALERTA_MUDANCA_NIVEL, self.tipos())
+        self.assertTrue(all(r.valida for r in resultados))
+
+    def test_pico_alerta_uma_vez_por_episodio(self):
+        self.aquecer()
+        for t in range(3):
+            self.assertFalse(self.detector.processar(amostra(100 + t, 90.0)).valida)
+        self.assertEqual(self.tipos(), [ALERTA_PICO])
+
+    def test_degrau_grande_recupera(self):
+        self.aquecer()
+        resultados = [self.detector.processar(amostra(100 + t, 70.0 + (t % 4) * 0.3))
+                      for t in range(500)]
+        self.assertEqual(self.tipos(), [ALERTA_PICO, ALERTA_MUDANCA_NIVEL])
+        excluidas = sum(1 for r in resultados if not r.valida)
+        self.assertEqual(excluidas, self.detector.amostras_degrau - 1)
+        self.assertTrue(all(r.valida for r in resultados[self.detector.amostras_degrau:]))
+
+    def test_rele_oscilando(self):
+        for t in range(20):
+            self.detector.processar({'dispositivo': 'esp32-01', 'timestamp': float(t),
+                                     'rele': t % 2 == 0})
+        self.assertEqual(self.tipos(), [ALERTA_RELE_OSCILANDO])
+
+    def test_rele_chaveamento_lento_sem_alerta(self):
+        for t in range(20):
+            self.detector.processar({'dispositivo': 'esp32-01', 'timestamp': t * 600.0,
+                                     'rele': t % 2 == 0})
+        self.assertEqual(self.alertas, [])
+
+    def test_estado_isolado_por_dispositivo(self):
+        self.aquecer(dispositivo='esp32-01')
+        resultado = self.detector.processar(amostra(0, 90.0, dispositivo='esp32-02'))
+        self.assertTrue(resultado.valida)
+        self.assertEqual(self.detector.total_dispositivos, 2)
+
+    def test_nan_ignorado(self):
+        resultado = self.detector.processar(amostra(0, float('nan')))
+        self.assertTrue(resultado.valida)
+        self.assertEqual(self.alertas, [])
+
+    def test_filtrar_telemetria(self):
+        amostras = [amostra(0, 50.0), amostra(1, -5.0), amostra(2, 50.4)]
+        validas = list(filtrar_telemetria(amostras, self.detector))
+        self.assertEqual([a['timestamp'] for a in validas], [0.0, 2.0])
+
+    def test_interpretar_linha_resumo(self):
+        linha = "N=1 P=0 K=1 | LDR AO= 812 DO=0 | pH=7.40(6.20) | T=24.0C H=42.5% | RELÉ=ON"
+        dados = interpretar_linha_resumo(linha, 'esp32-01', 10.0)
+        self.assertEqual(dados['ldr'], 812.0)
+        self.assertEqual(dados['ph'], 6.20)
+        self.assertEqual(dados['ph_ajustado'], 7.40)
+        self.assertEqual(dados['umidade'], 42.5)
+        self.assertTrue(dados['rele'])
+        self.assertIsNone(interpretar_linha_resumo("DHT22: reconfigurando sensor...", 'esp32-01', 0))
+
+    def test_botao_npk_nao_gera_alerta(self):
+        # N pressionado por ~54 s: pH ajustado sobe 0.80, pH base não muda
+        for i in range(120):
+            n = 1 if 30 <= i < 60 else 0
+            ph_base = 6.20 + (i % 5) * 0.01
+            linha = (f"N={n} P=0 K=0 | LDR AO={2000 + (i % 7) * 3:4d} DO=0 | "
+                     f"pH={ph_base + n * 0.80:.2f}({ph_base:.2f}) | "
+                     f"T=24.{i % 3}C H=5{i % 4}.0% | RELÉ=OFF")
+            dados = interpretar_linha_resumo(linha, 'esp32-01', i * 1.8)
+            self.assertTrue(self.detector.processar(dados).valida)
+        self.assertEqual(self.alertas, [])
+
+    def test_parametros_invalidos(self):
+        with self.assertRaises(ValueError):
+            DetectorAnomalias(alpha=0)
+        with self.assertRaises(ValueError):
+            self.detector.processar({'umidade': 50.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+FarmTech Solutions - Saúde dos Sensores e Detecção de Anomalias (Python)
+============================================================================
+Detector online de anomalias para a telemetria enviada pelos ESP32. Cada
+amostra é processada uma única vez (streaming) e o estado mantido por
+dispositivo tem tamanho constante, permitindo monitorar milhares de
+dispositivos em um único núcleo.
+
+Verificações realizadas por canal (umidade, temperatura, LDR, pH):
+    - Faixa física do sensor (ex.: umidade entre 0 e 100%)
+    - Valor travado (mesma leitura por mais tempo que o limite do canal)
+    - Pico isolado (z-score sobre média/variância EWMA)
+    - Mudança de nível (CUSUM bilateral sobre o resíduo padronizado, ou
+      degrau grande o bastante para manter várias leituras fora da banda)
+
+E por dispositivo:
+    - Taxa de chaveamento do relé (relé "oscilando")
+
+Leituras excluídas não devem entrar na análise estatística; use
+`filtrar_telemetria` para remover apenas os canais afetados de cada amostra.
+
+Autor: FarmTech Solutions
+Data: 2025
+Versão: 1.0
+============================================================================
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import logging
+import math
+import re
+
+# Configuração de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+# Faixa física aceita para cada canal (mínimo, máximo)
+LIMITES_CANAIS: Dict[str, Tuple[float, float]] = {
+    "umidade": (0.0, 100.0),        # DHT22: 0-100% UR
+    "temperatura": (-40.0, 80.0),   # DHT22: -40 a 80°C
+    "ldr": (0.0, 4095.0),           # ADC de 12 bits do ESP32
+    "ph": (0.0, 14.0),
+}
+
+# Desvio padrão mínimo por canal (resolução do sensor), evita z-scores
+# infinitos quando o sinal é muito estável
+DESVIO_MINIMO: Dict[str, float] = {
+    "umidade": 0.5,
+    "temperatura": 0.2,
+    "ldr": 20.0,
+    "ph": 0.05,
+}
+
+# Tempo máximo (s) com a mesma leitura antes de considerar o canal travado.
+# O resumo do firmware (logResumo) sai a cada ~1.8 s (LOG_MS = 1800) com T/H
+# arredondadas para 0.1, repetindo a última leitura quando o DHT22 falha;
+# temperatura e pH estáveis por minutos são normais (30 min ≈ 1000 resumos
+# iguais). Já o ADC de 12 bits do LDR sempre oscila alguns pontos, então
+# 2 min (≈ 67 resumos) com o mesmo valor indicam sensor travado/saturado
+TEMPO_TRAVADO_S: Dict[str, float] = {
+    "umidade": 900.0,
+    "temperatura": 1800.0,
+    "ldr": 120.0,
+    "ph": 1800.0,
+}
+
+# Tipos de alerta emitidos pelo detector
+ALERTA_FORA_DA_FAIXA = "fora_da_faixa"
+ALERTA_VALOR_TRAVADO = "valor_travado"
+ALERTA_PICO = "pico"
+ALERTA_MUDANCA_NIVEL = "mudanca_nivel"
+ALERTA_RELE_OSCILANDO = "rele_oscilando"
+
+# Linha de resumo periódico do firmware (logResumo)
+_PADRAO_RESUMO = re.compile(
+    r"N=(\d) P=(\d) K=(\d) \| LDR AO=\s*(\d+) DO=(\d) \| "
+    r"pH=([-\d.]+)\(([-\d.]+)\) \| T=([-\w.]+)C H=([-\w.]+)% \| RELÉ=(ON|OFF)"
+)
+
+
+class Alerta(NamedTuple):
+    """Alerta emitido pelo detector para um dispositivo."""
+    dispositivo: str
+    timestamp: float
+    canal: str
+    tipo: str
+    valor: float
+    detalhe: str
+
+
+class ResultadoAmostra(NamedTuple):
+    """Resultado do processamento de uma amostra de telemetria."""
+    valida: bool
+    canais_excluidos: Tuple[str, ...]
+    alertas: List[Alerta]
+
+
+class _EstadoCanal:
+    """Estado O(1) de um canal: EWMA, CUSUM e contagem de repetições."""
+
+    __slots__ = ("n", "media", "variancia", "cusum_pos", "cusum_neg",
+                 "ultimo", "ultimo_desde", "travado", "fora_da_banda")
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.variancia = 0.0
+        self.cusum_pos = 0.0
+        self.cusum_neg = 0.0
+        self.ultimo = math.nan
+        self.ultimo_desde = 0.0
+        self.travado = False
+        self.fora_da_banda = 0
+
+
+class _EstadoDispositivo:
+    """Estado O(1) de um dispositivo: canais e histórico resumido do relé."""
+
+    __slots__ = ("canais", "rele", "rele_ts", "taxa_rele", "rele_alertado")
+
+    def __init__(self, canais: Iterable[str]):
+        self.canais = {canal: _EstadoCanal() for canal in canais}
+        self.rele = None
+        self.rele_ts = 0.0
+        self.taxa_rele = 0.0
+        self.rele_alertado = False
+
+
+class DetectorAnomalias:
+    """
+    Detector online de anomalias na telemetria de múltiplos dispositivos.
+
+    Cada chamada a `processar` atualiza apenas o estado do dispositivo da
+    amostra, em tempo constante. Amostras são dicionários com as chaves
+    `dispositivo`, `timestamp` (segundos) e, opcionalmente, os canais
+    monitorados e `rele` (bool). Canais ausentes ou NaN são ignorados.
+    """
+
+    def __init__(self,
+                 alpha: float = 0.1,
+                 aquecimento: int = 20,
+                 limiar_pico: float = 6.0,
+                 cusum_k: float = 0.5,
+                 cusum_h: float = 8.0,
+                 amostras_degrau: int = 5,
+                 tolerancia_travado: float = 1e-6,
+                 janela_rele_s: float = 60.0,
+                 limite_chaveamentos: float = 6.0,
+                 limites: Optional[Dict[str, Tuple[float, float]]] = None,
+                 desvio_minimo: Optional[Dict[str, float]] = None,
+                 tempo_travado_s: Optional[Dict[str, float]] = None,
+                 ao_alertar: Optional[Callable[[Alerta], None]] = None):
+        """
+        Inicializa o detector.
+
+        Args:
+            alpha: Fator de suavização da EWMA (0 < alpha <= 1)
+            aquecimento: Amostras por canal antes de aplicar pico/CUSUM
+            limiar_pico: |z| acima do qual a leitura é tratada como pico
+            cusum_k: Folga do CUSUM, em desvios padrão
+            cusum_h: Limiar de decisão do CUSUM, em desvios padrão
+            amostras_degrau: Leituras seguidas acima de limiar_pico que
+                caracterizam um degrau real (novo nível) em vez de pico
+            tolerancia_travado: Diferença máxima para considerar leituras iguais
+            janela_rele_s: Constante de tempo (s) do contador de chaveamentos
+            limite_chaveamentos: Chaveamentos na janela para alertar oscilação
+            limites: Faixa física por canal (padrão: LIMITES_CANAIS)
+            desvio_minimo: Desvio padrão mínimo por canal (padrão: DESVIO_MINIMO)
+            tempo_travado_s: Tempo com a mesma leitura para considerar o canal
+                travado (padrão: TEMPO_TRAVADO_S)
+            ao_alertar: Callback chamado para cada alerta emitido
+
+        Raises:
+            ValueError: Se algum parâmetro estiver fora da faixa válida
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError(f"alpha {alpha} inválido. Deve estar em (0, 1].")
+        if amostras_degrau < 2:
+            raise ValueError("amostras_degrau deve ser pelo menos 2.")
+        if janela_rele_s <= 0:
+            raise ValueError("janela_rele_s deve ser positiva.")
+
+        self.alpha = alpha
+        self.aquecimento = aquecimento
+        self.limiar_pico = limiar_pico
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.amostras_degrau = amostras_degrau
+        self.tolerancia_travado = tolerancia_travado
+        self.janela_rele_s = janela_rele_s
+        self.limite_chaveamentos = limite_chaveamentos
+        self.limites = dict(limites if limites is not None else LIMITES_CANAIS)
+        desvios = desvio_minimo if desvio_minimo is not None else DESVIO_MINIMO
+        # Guardar a variância mínima evita um sqrt por amostra na comparação
+        self._variancia_minima = {
+            canal: desvios.get(canal, 0.0) ** 2 for canal in self.limites
+        }
+        tempos = tempo_travado_s if tempo_travado_s is not None else TEMPO_TRAVADO_S
+        self._tempo_travado = {
+            canal: tempos.get(canal, math.inf) for canal in self.limites
+        }
+        if any(t <= 0 for t in self._tempo_travado.values()):
+            raise ValueError("tempo_travado_s deve ser positivo para todos os canais.")
+        self.ao_alertar = ao_alertar
+        self._dispositivos: Dict[str, _EstadoDispositivo] = {}
+
+    @property
+    def total_dispositivos(self) -> int:
+        """Número de dispositivos com estado registrado."""
+        return len(self._dispositivos)
+
+    def esquecer(self, dispositivo: str) -> None:
+        """Descarta o estado de um dispositivo (ex.: após substituição)."""
+        self._dispositivos.pop(dispositivo, None)
+
+    def processar(self, amostra: dict) -> ResultadoAmostra:
+        """
+        Processa uma amostra de telemetria e atualiza o estado do dispositivo.
+
+        Args:
+            amostra: Dicionário com `dispositivo`, `timestamp` e leituras
+
+        Returns:
+            ResultadoAmostra: Validade, canais excluídos e alertas emitidos
+
+        Raises:
+            ValueError: Se `dispositivo` ou `timestamp` estiverem ausentes
+        """
+        try:
+            dispositivo = amostra["dispositivo"]
+            timestamp = amostra["timestamp"]
+        except KeyError as e:
+            raise ValueError(f"Amostra sem campo obrigatório: {e}") from None
+
+        estado = self._dispositivos.get(dispositivo)
+        if estado is None:
+            estado = _EstadoDispositivo(self.limites)
+            self._dispositivos[dispositivo] = estado
+
+        alertas: List[Alerta] = []
+        excluidos: List[str] = []
+
+        for canal, estado_canal in estado.canais.items():
+            valor = amostra.get(canal)
+            # NaN != NaN: descarta leituras ausentes (ex.: falha do DHT22)
+            if valor is None or valor != valor:
+                continue
+            motivo = self._verificar_canal(canal, estado_canal, valor, timestamp)
+            if motivo is not None:
+                tipo, detalhe = motivo
+                if tipo != ALERTA_MUDANCA_NIVEL:
+                    excluidos.append(canal)
+                if detalhe:
+                    alertas.append(Alerta(dispositivo, timestamp, canal, tipo, valor, detalhe))
+
+        rele = amostra.get("rele")
+        if rele is not None:
+            alerta_rele = self._verificar_rele(estado, dispositivo, timestamp, bool(rele))
+            if alerta_rele is not None:
+                alertas.append(alerta_rele)
+
+        if alertas and self.ao_alertar is not None:
+            for alerta in alertas:
+                self.ao_alertar(alerta)
+        elif alertas:
+            for alerta in alertas:
+                logger.warning(f"[{alerta.dispositivo}] {alerta.canal}: {alerta.detalhe}")
+
+        return ResultadoAmostra(not excluidos, tuple(excluidos), alertas)
+
+    def _verificar_canal(self, canal: str, estado: _EstadoCanal,
+                         valor: float, timestamp: float) -> Optional[Tuple[str, str]]:
+        """
+        Aplica as verificações de um canal.
+
+        Returns:
+            (tipo, detalhe) se a leitura for anômala, ou None se normal.
+            `detalhe` vazio indica exclusão sem novo alerta (episódio já alertado).
+        """
+        minimo, maximo = self.limites[canal]
+        if valor < minimo or valor > maximo:
+            return (ALERTA_FORA_DA_FAIXA,
+                    f"leitura {valor} fora da faixa [{minimo}, {maximo}]")
+
+        # Valor travado: mesma leitura por mais tempo que o limite do canal
+        if abs(valor - estado.ultimo) <= self.tolerancia_travado:
+            duracao = timestamp - estado.ultimo_desde
+            if duracao >= self._tempo_travado[canal]:
+                if estado.travado:
+                    return (ALERTA_VALOR_TRAVADO, "")
+                estado.travado = True
+                return (ALERTA_VALOR_TRAVADO,
+                        f"leitura {valor} inalterada há {duracao:.0f}s")
+        else:
+            estado.ultimo = valor
+            estado.ultimo_desde = timestamp
+            estado.travado = False
+
+        if estado.n == 0:
+            estado.n = 1
+            estado.media = valor
+            return None
+
+        desvio = valor - estado.media
+        variancia = estado.variancia
+        if variancia < self._variancia_minima[canal]:
+            variancia = self._variancia_minima[canal]
+
+        mudanca = None
+        if estado.n >= self.aquecimento and variancia > 0.0:
+            z = desvio / math.sqrt(variancia)
+            if z > self.limiar_pico or z < -self.limiar_pico:
+                estado.fora_da_banda += 1
+                if estado.fora_da_banda < self.amostras_degrau:
+                    # Possível pico isolado: não contamina média/variância
+                    if estado.fora_da_banda == 1:
+                        return (ALERTA_PICO, f"pico com z={z:.1f}")
+                    return (ALERTA_PICO, "")
+                # Leituras seguidas fora da banda: degrau real, recomeça no
+                # novo nível mantendo a variância (o ruído do sensor não muda)
+                anterior = estado.media
+                estado.media = valor
+                estado.cusum_pos = 0.0
+                estado.cusum_neg = 0.0
+                estado.fora_da_banda = 0
+                direcao = "subida" if desvio > 0 else "queda"
+                return (ALERTA_MUDANCA_NIVEL,
+                        f"{direcao} de nível de {anterior:.2f} para {valor:.2f}")
+            estado.fora_da_banda = 0
+
+            cusum_pos = estado.cusum_pos + z - self.cusum_k
+            cusum_neg = estado.cusum_neg - z - self.cusum_k
+            estado.cusum_pos = cusum_pos if cusum_pos > 0.0 else 0.0
+            estado.cusum_neg = cusum_neg if cusum_neg > 0.0 else 0.0
+            if estado.cusum_pos > self.cusum_h or estado.cusum_neg > self.cusum_h:
+                direcao = "subida" if estado.cusum_pos > self.cusum_h else "queda"
+                mudanca = (ALERTA_MUDANCA_NIVEL,
+                           f"{direcao} de nível a partir de {estado.media:.2f}")
+                estado.cusum_pos = 0.0
+                estado.cusum_neg = 0.0
+
+        estado.n += 1
+        estado.media += self.alpha * desvio
+        estado.variancia = (1.0 - self.alpha) * (estado.variancia + self.alpha * desvio * desvio)
+        return mudanca
+
+    def _verificar_rele(self, estado: _EstadoDispositivo, dispositivo: str,
+                        timestamp: float, rele: bool) -> Optional[Alerta]:
+        """Atualiza o contador decaído de chaveamentos e detecta oscilação."""
+        if estado.rele is None or rele == estado.rele:
+            estado.rele = rele
+            return None
+
+        estado.rele = rele
+        decorrido = timestamp - estado.rele_ts
+        if decorrido < 0:
+            decorrido = 0.0
+        estado.taxa_rele = estado.taxa_rele * math.exp(-decorrido / self.janela_rele_s) + 1.0
+        estado.rele_ts = timestamp
+
+        if estado.taxa_rele >= self.limite_chaveamentos:
+            if not estado.rele_alertado:
+                estado.rele_alertado = True
+                return Alerta(dispositivo, timestamp, "rele", ALERTA_RELE_OSCILANDO,
+                              estado.taxa_rele,
+                              f"{estado.taxa_rele:.1f} chaveamentos em ~{self.janela_rele_s:.0f}s")
+        elif estado.taxa_rele < self.limite_chaveamentos / 2:
+            # Histerese: rearma o alerta só quando a taxa cai bem abaixo do limite
+            estado.rele_alertado = False
+        return None
+
+
+def filtrar_telemetria(amostras: Iterable[dict],
+                       detector: Optional[DetectorAnomalias] = None) -> Iterator[dict]:
+    """
+    Percorre a telemetria removendo as leituras excluídas pelo detector.
+
+    Destinado a alimentar a análise estatística sem leituras defeituosas.
+    Apenas os canais afetados são descartados (viram None, ou NA no R); a
+    amostra só é omitida quando todos os seus canais monitorados forem
+    excluídos.
+
+    Args:
+        amostras: Sequência (ou stream) de amostras de telemetria
+        detector: Detector a utilizar (um novo é criado se omitido)
+
+    Yields:
+        dict: Amostras sem leituras excluídas pelo detector
+    """
+    if detector is None:
+        detector = DetectorAnomalias()
+    for amostra in amostras:
+        resultado = detector.processar(amostra)
+        if resultado.valida:
+            yield amostra
+            continue
+        restantes = [c for c in detector.limites
+                     if c not in resultado.canais_excluidos
+                     and amostra.get(c) is not None and amostra[c] == amostra[c]]
+        if restantes:
+            limpa = dict(amostra)
+            for canal in resultado.canais_excluidos:
+                limpa[canal] = None
+            yield limpa
+
+
+def interpretar_linha_resumo(linha: str, dispositivo: str, timestamp: float) -> Optional[dict]:
+    """
+    Converte a linha de resumo periódico do firmware em amostra de telemetria.
+
+    Formato esperado (logResumo no ESP32):
+    N=1 P=0 K=1 | LDR AO=2048 DO=0 | pH=7.40(6.20) | T=24.0C H=42.5% | RELÉ=ON
+
+    O canal `ph` recebe o pH base derivado do LDR (valor entre parênteses).
+    O pH ajustado pelos botões NPK fica em `ph_ajustado`, fora dos canais
+    monitorados: pressionar um botão desloca o valor em até 0.8 e não é falha
+    de sensor.
+
+    Args:
+        linha: Linha recebida pela serial
+        dispositivo: Identificador do dispositivo de origem
+        timestamp: Instante de recebimento em segundos
+
+    Returns:
+        dict: Amostra de telemetria, ou None se a linha não for um resumo
+    """
+    m = _PADRAO_RESUMO.search(linha)
+    if m is None:
+        return None
+    return {
+        "dispositivo": dispositivo,
+        "timestamp": timestamp,
+        "n": int(m.group(1)),
+        "p": int(m.group(2)),
+        "k": int(m.group(3)),
+        "ldr": float(m.group(4)),
+        "ph": float(m.group(7)),
+        "ph_ajustado": float(m.group(6)),
+        "temperatura": float(m.group(8)),
+        "umidade": float(m.group(9)),
+        "rele": m.group(10) == "ON",
+    }